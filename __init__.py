@@ -16,19 +16,21 @@ __all__ = [
 
 
 # Convenience function for other agents to use
-def ensure_cloud_environment(project_id: str, location: str = "global"):
+def ensure_cloud_environment(project_id: str, location: str = "global", force_refresh: bool = False):
     """
     Convenience function to ensure GCP environment is properly configured.
     
-    This function creates a CloudSentinel instance and runs environment validation.
+    This function reuses the shared CloudSentinel for the project and runs
+    environment validation.
     Other agents can call this function to ensure their GCP dependencies are met.
     
     Args:
         project_id: GCP project ID
         location: Location for Secret Manager (default: global)
+        force_refresh: Re-validate even if a recent healthy result is cached
         
     Returns:
         Dict containing environment status and any issues found
     """
     sentinel = create_cloud_sentinel(project_id=project_id, location=location)
-    return sentinel.ensure_environment()
+    return sentinel.ensure_environment(force_refresh=force_refresh)
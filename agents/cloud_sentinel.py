@@ -4,14 +4,23 @@ CloudSentinel Agent for EchoForge
 This module handles GCP service management, IAM validation, and service account key rotation.
 """
 
+import asyncio
+import concurrent.futures
+import copy
+import functools
 import logging
+import random
+import threading
 import time
 from typing import List, Dict, Optional, Tuple
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 try:
-    from google.cloud import service_usage_v1, iam_v1, secretmanager
-    from google.cloud.exceptions import NotFound, PermissionDenied, GoogleCloudError
+    import google.auth
+    from google.auth import compute_engine
+    from google.auth.exceptions import DefaultCredentialsError
+    from google.cloud import service_usage_v1, iam_v1, secretmanager, resourcemanager_v3
+    from google.cloud.exceptions import PermissionDenied, GoogleCloudError
     from google.api_core import exceptions as api_exceptions
     GCP_AVAILABLE = True
 except ImportError:
@@ -19,10 +28,14 @@ except ImportError:
     # Define mock classes for testing
     class MockException(Exception):
         pass
-    NotFound = MockException
     PermissionDenied = MockException
     GoogleCloudError = MockException
-    api_exceptions = type('MockExceptions', (), {'AlreadyExists': MockException})()
+    api_exceptions = type('MockExceptions', (), {
+        'AlreadyExists': MockException,
+        'FailedPrecondition': MockException,
+        'Aborted': MockException,
+        'ResourceExhausted': MockException,
+    })()
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +45,69 @@ class CloudSentinelError(Exception):
     pass
 
 
+# Keep HTTP/2 connections warm so bursts of RPCs skip the TCP/TLS handshake
+GRPC_CHANNEL_OPTIONS = (
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.keepalive_timeout_ms", 10000),
+    ("grpc.http2.max_pings_without_data", 0),
+    ("grpc.max_receive_message_length", 32 * 1024 * 1024),
+)
+
+# IAM member prefix for service accounts
+SERVICE_ACCOUNT_PREFIX = "serviceAccount:"
+
+# Maps a service account email onto a valid Secret Manager secret ID
+SECRET_ID_TRANSLATION = str.maketrans("@.", "--")
+
+# BatchEnableServices accepts at most 20 service IDs per request
+BATCH_ENABLE_LIMIT = 20
+
+# Bounded exponential backoff with jitter for transient RPC failures
+RETRY_MAX_ATTEMPTS = 5
+RETRY_BACKOFF_BASE = 2.0
+RETRY_BACKOFF_MAX = 60.0
+
+# Concurrent enables per project; more trigger "Another activation ... in progress"
+ENABLE_MAX_CONCURRENCY = 4
+
+# Bounded retry for concurrent IAM policy updates (etag conflicts)
+SET_POLICY_MAX_ATTEMPTS = 3
+
+# Background key rotation cadence (seconds)
+ROTATION_PERIOD = 86400
+
+# A healthy ensure_environment result is reused for this long (seconds)
+HEALTHY_RESULT_TTL = 300.0
+
+# Enabled-services list reused by direct ensure_api calls for this long (seconds)
+ENABLED_SERVICES_TTL = 300.0
+
+# IAM policies are cached briefly so a validation pass fetches each one once
+POLICY_CACHE_TTL = 60.0
+POLICY_CACHE_MAXSIZE = 1024
+
+
+_shared_clients: Dict[type, object] = {}
+_shared_clients_lock = threading.Lock()
+
+
+def _shared_grpc_client(client_cls):
+    """
+    Get the process-wide client of the given class on a keepalive-tuned channel.
+    
+    Clients are not tied to a project and gRPC channels are safe for
+    concurrent use, so every CloudSentinel shares one client per service.
+    """
+    with _shared_clients_lock:
+        client = _shared_clients.get(client_cls)
+        if client is None:
+            transport_cls = client_cls.get_transport_class("grpc")
+            channel = transport_cls.create_channel(options=list(GRPC_CHANNEL_OPTIONS))
+            client = client_cls(transport=transport_cls(channel=channel))
+            _shared_clients[client_cls] = client
+        return client
+
+
 class CloudSentinel:
     """
     CloudSentinel agent responsible for:
@@ -40,6 +116,57 @@ class CloudSentinel:
     - Auto-rotating service account keys
     """
     
+    # Required APIs for EchoForge operations
+    REQUIRED_APIS = frozenset({
+        "serviceusage.googleapis.com",
+        "iam.googleapis.com",
+        "secretmanager.googleapis.com",
+        "cloudbuild.googleapis.com",
+        "cloudresourcemanager.googleapis.com",
+        "logging.googleapis.com",
+        "monitoring.googleapis.com"
+    })
+    
+    # Critical roles for service accounts
+    CRITICAL_ROLES = frozenset({
+        "roles/secretmanager.secretAccessor",
+        "roles/secretmanager.secretVersionManager",
+        "roles/cloudbuild.builds.builder",
+        "roles/logging.logWriter",
+        "roles/monitoring.metricWriter"
+    })
+    
+    # (project_id, location) -> (completed_at, result) of the last healthy run
+    _last_result: Dict[Tuple[str, str], Tuple[float, Dict[str, any]]] = {}
+    
+    # Permissions checked with testIamPermissions for each critical role
+    PERMISSIONS_BY_ROLE: Dict[str, Tuple[str, ...]] = {
+        "roles/secretmanager.secretAccessor": (
+            "secretmanager.versions.access",
+        ),
+        "roles/secretmanager.secretVersionManager": (
+            "secretmanager.versions.add",
+            "secretmanager.versions.destroy",
+            "secretmanager.versions.disable",
+            "secretmanager.versions.enable",
+            "secretmanager.versions.get",
+            "secretmanager.versions.list",
+        ),
+        "roles/cloudbuild.builds.builder": (
+            "cloudbuild.builds.create",
+            "cloudbuild.builds.get",
+            "cloudbuild.builds.list",
+        ),
+        "roles/logging.logWriter": (
+            "logging.logEntries.create",
+        ),
+        "roles/monitoring.metricWriter": (
+            "monitoring.metricDescriptors.create",
+            "monitoring.metricDescriptors.list",
+            "monitoring.timeSeries.create",
+        ),
+    }
+    
     def __init__(self, project_id: str, location: str = "global"):
         """
         Initialize CloudSentinel.
@@ -55,41 +182,98 @@ class CloudSentinel:
         if not GCP_AVAILABLE:
             raise CloudSentinelError(
                 "Google Cloud libraries are not available. Please install them using: "
-                "pip install google-cloud-service-usage google-cloud-iam google-cloud-secret-manager"
+                "pip install google-cloud-service-usage google-cloud-iam google-cloud-secret-manager "
+                "google-cloud-resource-manager"
             )
         
-        self.service_usage_client = service_usage_v1.ServiceUsageClient()
-        self.iam_client = iam_v1.IAMClient()
-        self.secret_client = secretmanager.SecretManagerServiceClient()
-        
-        # Required APIs for EchoForge operations
-        self.required_apis = [
-            "serviceusage.googleapis.com",
-            "iam.googleapis.com",
-            "secretmanager.googleapis.com",
-            "cloudbuild.googleapis.com",
-            "cloudresourcemanager.googleapis.com",
-            "logging.googleapis.com",
-            "monitoring.googleapis.com"
-        ]
-        
-        # Critical roles for service accounts
-        self.critical_roles = [
-            "roles/secretmanager.secretAccessor",
-            "roles/secretmanager.secretVersionManager",
-            "roles/cloudbuild.builds.builder",
-            "roles/logging.logWriter",
-            "roles/monitoring.metricWriter"
-        ]
-    
-    def ensure_environment(self) -> Dict[str, any]:
+        self.service_usage_client = _shared_grpc_client(service_usage_v1.ServiceUsageClient)
+        self.iam_client = _shared_grpc_client(iam_v1.IAMClient)
+        self.secret_client = _shared_grpc_client(secretmanager.SecretManagerServiceClient)
+        self.resource_manager_client = _shared_grpc_client(resourcemanager_v3.ProjectsClient)
+        
+        # On GCE/GKE/Cloud Run the metadata server issues short-lived tokens,
+        # so there are no long-lived keys to rotate; checked on first rotation
+        # because resolving credentials may block on the metadata server
+        self._rotation_enabled: Optional[bool] = None
+        
+        # Outcome of the most recent key rotation; None until one has run
+        self._last_rotation_result: Optional[Dict[str, List[str]]] = None
+        self._last_rotation_at: Optional[float] = None
+        self._rotation_task: Optional[asyncio.Task] = None
+        
+        # Names of services known to be enabled; loaded lazily with one list call
+        self._enabled_services: Optional[set] = None
+        self._enabled_services_loaded_at = 0.0
+        self._enable_sema = threading.Semaphore(ENABLE_MAX_CONCURRENCY)
+        
+        # resource -> (fetched_at, policy), oldest entry first
+        self._policy_cache: Dict[str, Tuple[float, object]] = {}
+        self._policy_cache_lock = threading.Lock()
+    
+    def ensure_environment(self, force_refresh: bool = False) -> Dict[str, any]:
         """
         Ensure the GCP environment is properly configured.
         
+        Runs ensure_environment_async on a fresh event loop. Called from a
+        coroutine, that loop runs on a worker thread and the caller's loop is
+        blocked until it finishes; await ensure_environment_async there instead.
+        
+        Args:
+            force_refresh: Re-validate even if a recent healthy result is cached
+        
         Returns:
             Dict containing environment status and any issues found
         """
+        def run():
+            return asyncio.run(self.ensure_environment_async(force_refresh=force_refresh))
+        
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return run()
+        
+        # asyncio.run refuses to nest inside a running loop
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(run).result()
+    
+    async def ensure_environment_async(self, force_refresh: bool = False) -> Dict[str, any]:
+        """
+        Ensure the GCP environment is properly configured.
+        
+        API enablement and IAM validation run concurrently once every required
+        API is enabled; on a project still missing some, validation waits for
+        enablement to finish. Key rotation is reported from the last run of the
+        task started by start_background_tasks; without a running task, rotation
+        runs inline when the last one is older than ROTATION_PERIOD.
+        A healthy result is reused for HEALTHY_RESULT_TTL seconds; results with
+        issues or errors are never cached.
+        
+        "key_rotation_status" is "completed", "skipped" (workload credentials,
+        see "key_rotation_note") or "pending" (the background task has not
+        finished its first rotation yet).
+        
+        "permissions_valid"/"permissions_missing" list "<role>:<permission>"
+        for each critical role, as held (or not) by the identity running
+        CloudSentinel. Use audit_service_account_roles for a per-account check.
+        
+        Args:
+            force_refresh: Re-validate even if a recent healthy result is cached
+        
+        Returns:
+            Dict containing environment status and any issues found
+        """
+        cache_key = (self.project_id, self.location)
+        if not force_refresh:
+            cached = self._last_result.get(cache_key)
+            if cached is not None and time.monotonic() - cached[0] < HEALTHY_RESULT_TTL:
+                logger.info("Reusing recent healthy CloudSentinel validation result")
+                return copy.deepcopy(cached[1])
+        
         logger.info("Starting CloudSentinel environment validation")
+        started_at = time.time()
+        
+        # APIs may have been disabled since the last run, so list them afresh
+        self._enabled_services = None
         
         results = {
             "apis_enabled": [],
@@ -98,28 +282,37 @@ class CloudSentinel:
             "permissions_missing": [],
             "keys_rotated": [],
             "keys_failed": [],
-            "timestamp": datetime.utcnow().isoformat(),
+            "key_rotation_status": "pending",
+            "timestamp": datetime.fromtimestamp(started_at, tz=timezone.utc).isoformat(),
             "overall_status": "unknown"
         }
         
         try:
-            # Step 1: Ensure required APIs are enabled
-            logger.info("Checking and enabling required APIs")
-            api_results = self._ensure_required_apis()
+            logger.info("Checking required APIs, IAM permissions and key rotation")
+            rotation = asyncio.create_task(self._rotation_results_async())
+            if await self._apis_pending_async():
+                # IAM and Resource Manager calls fail until their APIs are on
+                api_results = await self._ensure_required_apis_async()
+                iam_results = await self._validate_iam_permissions_async()
+            else:
+                api_results, iam_results = await asyncio.gather(
+                    self._ensure_required_apis_async(),
+                    self._validate_iam_permissions_async()
+                )
+            key_results = await rotation
+            
             results["apis_enabled"] = api_results["enabled"]
             results["apis_failed"] = api_results["failed"]
-            
-            # Step 2: Validate IAM permissions
-            logger.info("Validating IAM permissions")
-            iam_results = self._validate_iam_permissions()
             results["permissions_valid"] = iam_results["valid"]
             results["permissions_missing"] = iam_results["missing"]
-            
-            # Step 3: Rotate service account keys if needed
-            logger.info("Checking service account key rotation")
-            key_results = self._rotate_service_account_keys()
-            results["keys_rotated"] = key_results["rotated"]
-            results["keys_failed"] = key_results["failed"]
+            if key_results is not None:
+                results["keys_rotated"] = key_results["rotated"]
+                results["keys_failed"] = key_results["failed"]
+                if "note" in key_results:
+                    results["key_rotation_status"] = "skipped"
+                    results["key_rotation_note"] = key_results["note"]
+                else:
+                    results["key_rotation_status"] = "completed"
             
             # Determine overall status
             if results["apis_failed"] or results["permissions_missing"] or results["keys_failed"]:
@@ -127,12 +320,22 @@ class CloudSentinel:
             else:
                 results["overall_status"] = "healthy"
                 
-            logger.info(f"CloudSentinel validation completed. Status: {results['overall_status']}")
+            logger.info(
+                f"CloudSentinel validation completed in {time.time() - started_at:.1f}s. "
+                f"Status: {results['overall_status']}"
+            )
+            
+            # A pending rotation has not been verified yet, so don't reuse the result
+            if results["overall_status"] == "healthy" and results["key_rotation_status"] != "pending":
+                self._last_result[cache_key] = (time.monotonic(), copy.deepcopy(results))
+            else:
+                self._last_result.pop(cache_key, None)
             
         except Exception as e:
             logger.error(f"CloudSentinel validation failed: {str(e)}")
             results["overall_status"] = "error"
             results["error"] = str(e)
+            self._last_result.pop(cache_key, None)
             
         return results
     
@@ -151,19 +354,26 @@ class CloudSentinel:
             
             # Check if API is already enabled
             try:
-                service = self.service_usage_client.get_service(name=service_name)
-                if service.state == service_usage_v1.State.ENABLED:
+                if name in self._load_enabled_services():
                     logger.info(f"API {name} is already enabled")
                     return True
-            except NotFound:
-                logger.info(f"API {name} is not enabled, attempting to enable")
+            except Exception as e:
+                # Enabling an already-enabled API is a no-op, so carry on
+                logger.warning(f"Failed to list enabled services: {str(e)}")
+            logger.info(f"API {name} is not enabled, attempting to enable")
             
-            # Enable the API
-            operation = self.service_usage_client.enable_service(name=service_name)
+            def enable():
+                with self._enable_sema:
+                    operation = self.service_usage_client.enable_service(name=service_name)
+                    
+                    # Wait for operation to complete
+                    operation.result(timeout=300)  # 5 minute timeout
             
-            # Wait for operation to complete
-            result = operation.result(timeout=300)  # 5 minute timeout
+            # Enable the API, backing off while another activation in the
+            # project is still running or quota is exhausted
+            self._retry_rpc(enable, (api_exceptions.FailedPrecondition, api_exceptions.ResourceExhausted))
             
+            self._mark_service_enabled(name)
             logger.info(f"Successfully enabled API: {name}")
             return True
             
@@ -182,105 +392,361 @@ class CloudSentinel:
         Returns:
             True if role is properly assigned, False otherwise
         """
-        try:
-            resource = f"projects/{self.project_id}"
-            
-            # Get current IAM policy
-            policy = self.iam_client.get_iam_policy(resource=resource)
+        return self.ensure_roles(sa_email, [role])[role]
+    
+    def ensure_roles(self, sa_email: str, roles: List[str]) -> Dict[str, bool]:
+        """
+        Ensure a service account has all of the specified roles.
+        
+        Args:
+            sa_email: Service account email
+            roles: IAM roles to check/assign
             
-            # Check if the binding already exists
-            member = f"serviceAccount:{sa_email}"
-            for binding in policy.bindings:
-                if binding.role == role and member in binding.members:
-                    logger.info(f"Role {role} already assigned to {sa_email}")
-                    return True
+        Returns:
+            Dict mapping each role to True if properly assigned, False otherwise
+        """
+        results = self.ensure_bindings([(sa_email, role) for role in roles])
+        return {role: results[(sa_email, role)] for role in roles}
+    
+    def ensure_bindings(self, bindings: List[Tuple[str, str]]) -> Dict[Tuple[str, str], bool]:
+        """
+        Ensure each (service account email, role) pair is bound in the project policy.
+        
+        The policy is fetched once and written back at most once, so assigning
+        many roles across service accounts costs a single read-modify-write.
+        Concurrent updates (etag conflicts) are retried against a fresh policy.
+        
+        Args:
+            bindings: (sa_email, role) pairs to check/assign
             
-            # Add the role binding
-            from google.cloud.iam_v1 import Binding
-            new_binding = Binding(
-                role=role,
-                members=[member]
-            )
+        Returns:
+            Dict mapping each pair to True if properly assigned, False otherwise
+        """
+        resource = f"projects/{self.project_id}"
+        
+        def assign():
+            # Edit a copy so the cache only ever holds the server's state
+            cached = self._get_policy_cached(resource)
+            policy = type(cached)()
+            policy.CopyFrom(cached)
             
-            # Check if binding for this role exists
-            role_exists = False
+            by_role = {}
             for binding in policy.bindings:
-                if binding.role == role:
+                by_role.setdefault(binding.role, binding)
+            
+            dirty = False
+            for sa_email, role in bindings:
+                member = SERVICE_ACCOUNT_PREFIX + sa_email
+                binding = by_role.get(role)
+                if binding is None:
+                    policy.bindings.append(iam_v1.Binding(role=role, members=[member]))
+                    by_role[role] = policy.bindings[-1]
+                    dirty = True
+                elif member not in binding.members:
                     binding.members.append(member)
-                    role_exists = True
-                    break
+                    dirty = True
+                else:
+                    logger.info(f"Role {role} already assigned to {sa_email}")
             
-            if not role_exists:
-                policy.bindings.append(new_binding)
+            if dirty:
+                try:
+                    updated = self.iam_client.set_iam_policy(resource=resource, policy=policy)
+                except Exception:
+                    # The cached etag may be stale; refetch on retry
+                    self._invalidate_policy(resource)
+                    raise
+                
+                # Keep the cache warm with the server's copy, which carries the new etag
+                self._store_policy(resource, updated)
+                logger.info(f"Successfully assigned {len(bindings)} role binding(s)")
+        
+        try:
+            self._retry_rpc(
+                assign,
+                (api_exceptions.Aborted, api_exceptions.FailedPrecondition, api_exceptions.ResourceExhausted),
+                max_attempts=SET_POLICY_MAX_ATTEMPTS
+            )
+            return {pair: True for pair in bindings}
+        except Exception as e:
+            logger.error(f"Failed to assign role bindings: {str(e)}")
+            return {pair: False for pair in bindings}
+    
+    def _retry_rpc(self, fn, retriable_excs: Tuple[type, ...], max_attempts: int = RETRY_MAX_ATTEMPTS):
+        """
+        Call fn, retrying transient failures with exponential backoff and jitter.
+        
+        Args:
+            fn: Zero-argument callable issuing the RPC
+            retriable_excs: Exception types worth retrying
+            max_attempts: Total number of attempts before re-raising
             
-            # Set the updated policy
-            self.iam_client.set_iam_policy(resource=resource, policy=policy)
+        Returns:
+            Whatever fn returns
+        """
+        for attempt in range(1, max_attempts + 1):
+            try:
+                return fn()
+            except retriable_excs as e:
+                if attempt == max_attempts or not self._is_transient(e):
+                    raise
+                delay = self._backoff_delay(attempt)
+                logger.info(f"{type(e).__name__}: {str(e)}; retrying in {delay:.1f}s")
+                time.sleep(delay)
+    
+    @staticmethod
+    def _is_transient(exc: Exception) -> bool:
+        """FailedPrecondition is only transient for in-flight activations and etag conflicts"""
+        if isinstance(exc, api_exceptions.FailedPrecondition):
+            message = str(exc)
+            return "Another activation" in message or "etag" in message.lower()
+        return True
+    
+    @staticmethod
+    def _backoff_delay(attempt: int) -> float:
+        """Exponential backoff with jitter, capped at RETRY_BACKOFF_MAX"""
+        return min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE ** attempt + random.random() * attempt)
+    
+    async def _ensure_required_apis_async(self) -> Dict[str, List[str]]:
+        """
+        Ensure all required APIs are enabled.
+        
+        The RPCs go through the shared, keepalive-tuned sync client on worker
+        threads, so repeated runs reuse one warm channel whatever the event loop.
+        """
+        enabled = []
+        failed = []
+        
+        # One list call replaces a get_service round-trip per API
+        try:
+            already_enabled = await asyncio.to_thread(self._load_enabled_services)
+        except Exception as e:
+            logger.warning(f"Failed to list enabled services, enabling all required APIs: {str(e)}")
+            already_enabled = set()
+        
+        enabled.extend(sorted(self.REQUIRED_APIS & already_enabled))
+        if enabled:
+            logger.info(f"APIs already enabled: {', '.join(enabled)}")
+        pending = sorted(self.REQUIRED_APIS - already_enabled)
+        
+        for start in range(0, len(pending), BATCH_ENABLE_LIMIT):
+            chunk = pending[start:start + BATCH_ENABLE_LIMIT]
+            if await asyncio.to_thread(self._batch_enable_apis, chunk):
+                enabled.extend(chunk)
+                continue
             
-            logger.info(f"Successfully assigned role {role} to {sa_email}")
+            # Fall back to concurrent per-API enables to report failures
+            # individually; ensure_api caps how many activations run at once
+            outcomes = await asyncio.gather(*(asyncio.to_thread(self.ensure_api, api) for api in chunk))
+            for api, ok in zip(chunk, outcomes):
+                if ok:
+                    enabled.append(api)
+                else:
+                    failed.append(api)
+        
+        return {"enabled": enabled, "failed": failed}
+    
+    async def _apis_pending_async(self) -> bool:
+        """Whether any required API is not yet known to be enabled"""
+        try:
+            already_enabled = await asyncio.to_thread(self._load_enabled_services)
+        except Exception:
             return True
+        return not self.REQUIRED_APIS <= already_enabled
+    
+    def _load_enabled_services(self) -> set:
+        """Load the names of enabled services, reusing a list younger than ENABLED_SERVICES_TTL"""
+        if (self._enabled_services is None
+                or time.monotonic() - self._enabled_services_loaded_at >= ENABLED_SERVICES_TTL):
+            pager = self.service_usage_client.list_services(
+                request=service_usage_v1.ListServicesRequest(
+                    parent=f"projects/{self.project_id}",
+                    filter="state:ENABLED"
+                )
+            )
+            self._enabled_services = {service.config.name for service in pager}
+            self._enabled_services_loaded_at = time.monotonic()
+        return self._enabled_services
+    
+    def _mark_service_enabled(self, name: str) -> None:
+        """Record a newly enabled service in the enabled-services cache"""
+        if self._enabled_services is not None:
+            self._enabled_services.add(name)
+    
+    def _batch_enable_apis(self, apis: List[str]) -> bool:
+        """
+        Enable several APIs with a single BatchEnableServices operation.
+        
+        Args:
+            apis: API names to enable (at most BATCH_ENABLE_LIMIT)
             
+        Returns:
+            True if all APIs were enabled, False otherwise
+        """
+        if not apis:
+            return True
+        
+        request = service_usage_v1.BatchEnableServicesRequest(
+            parent=f"projects/{self.project_id}",
+            service_ids=list(apis)
+        )
+        
+        def batch_enable():
+            operation = self.service_usage_client.batch_enable_services(request=request)
+            operation.result(timeout=300)  # 5 minute timeout
+        
+        try:
+            self._retry_rpc(
+                batch_enable,
+                (api_exceptions.FailedPrecondition, api_exceptions.ResourceExhausted)
+            )
         except Exception as e:
-            logger.error(f"Failed to assign role {role} to {sa_email}: {str(e)}")
+            logger.error(f"Failed to enable APIs {', '.join(apis)}: {str(e)}")
             return False
+        
+        for api in apis:
+            self._mark_service_enabled(api)
+        logger.info(f"Successfully enabled APIs: {', '.join(apis)}")
+        return True
     
-    def _ensure_required_apis(self) -> Dict[str, List[str]]:
-        """Ensure all required APIs are enabled"""
-        enabled = []
-        failed = []
+    async def _validate_iam_permissions_async(self) -> Dict[str, List[str]]:
+        """Validate IAM permissions off the event loop"""
+        return await asyncio.to_thread(self._validate_iam_permissions)
+    
+    def _validate_iam_permissions(self) -> Dict[str, List[str]]:
+        """Validate that the caller holds the permissions behind the critical roles"""
+        valid = []
+        missing = []
         
-        for api in self.required_apis:
-            if self.ensure_api(api):
-                enabled.append(api)
-            else:
-                failed.append(api)
+        try:
+            critical_roles = sorted(self.CRITICAL_ROLES)
+            requested = sorted({
+                permission
+                for role in critical_roles
+                for permission in self.PERMISSIONS_BY_ROLE.get(role, ())
+            })
+            
+            # A single Resource Manager call returns only the permissions
+            # the caller holds on the project
+            response = self.resource_manager_client.test_iam_permissions(
+                resource=f"projects/{self.project_id}",
+                permissions=requested
+            )
+            granted = set(response.permissions)
+            
+            for role in critical_roles:
+                for permission in self.PERMISSIONS_BY_ROLE.get(role, ()):
+                    if permission in granted:
+                        valid.append(f"{role}:{permission}")
+                    else:
+                        missing.append(f"{role}:{permission}")
+                        
+        except Exception as e:
+            logger.error(f"Failed to validate IAM permissions: {str(e)}")
+            missing.append(f"validation_error: {str(e)}")
         
-        return {"enabled": enabled, "failed": failed}
+        return {"valid": valid, "missing": missing}
     
-    def _validate_iam_permissions(self) -> Dict[str, List[str]]:
-        """Validate IAM permissions for critical service accounts"""
+    def audit_service_account_roles(self) -> Dict[str, List[str]]:
+        """
+        Check every service account in the project policy for the critical roles.
+        
+        Not part of ensure_environment, which only tests the caller's
+        permissions; this fetches and scans the full project policy.
+        
+        Returns:
+            Dict with "valid" and "missing" lists of "<sa_email>:<role>" entries
+        """
         valid = []
         missing = []
         
         try:
             # Get all service accounts in the project
             resource = f"projects/{self.project_id}"
-            policy = self.iam_client.get_iam_policy(resource=resource)
+            policy = self._get_policy_cached(resource)
             
-            # Extract service accounts from policy bindings
-            service_accounts = set()
+            # Single pass over the bindings: every service account seen (in
+            # order), plus one flat set of the critical grants among them
+            service_accounts: Dict[str, None] = {}
+            held = set()
             for binding in policy.bindings:
+                is_critical = binding.role in self.CRITICAL_ROLES
                 for member in binding.members:
-                    if member.startswith("serviceAccount:"):
-                        sa_email = member.replace("serviceAccount:", "")
-                        service_accounts.add(sa_email)
+                    # removeprefix returns the same object when the prefix is absent
+                    sa_email = member.removeprefix(SERVICE_ACCOUNT_PREFIX)
+                    if sa_email is not member:
+                        service_accounts[sa_email] = None
+                        if is_critical:
+                            held.add((sa_email, binding.role))
             
             # Check critical roles for each service account
+            critical_roles = sorted(self.CRITICAL_ROLES)
             for sa_email in service_accounts:
-                for role in self.critical_roles:
-                    if self._has_role(sa_email, role, policy):
+                for role in critical_roles:
+                    if (sa_email, role) in held:
                         valid.append(f"{sa_email}:{role}")
                     else:
                         missing.append(f"{sa_email}:{role}")
                         
         except Exception as e:
-            logger.error(f"Failed to validate IAM permissions: {str(e)}")
+            logger.error(f"Failed to audit service account roles: {str(e)}")
             missing.append(f"validation_error: {str(e)}")
         
         return {"valid": valid, "missing": missing}
     
-    def _has_role(self, sa_email: str, role: str, policy) -> bool:
-        """Check if service account has specific role"""
-        member = f"serviceAccount:{sa_email}"
-        for binding in policy.bindings:
-            if binding.role == role and member in binding.members:
-                return True
-        return False
+    def _get_policy_cached(self, resource: str, ttl: float = POLICY_CACHE_TTL):
+        """Get the IAM policy for a resource, reusing a fetch younger than ttl seconds"""
+        now = time.monotonic()
+        with self._policy_cache_lock:
+            entry = self._policy_cache.pop(resource, None)
+            if entry is not None and now - entry[0] < ttl:
+                # Re-insert to mark as most recently used
+                self._policy_cache[resource] = entry
+                return entry[1]
+        
+        policy = self.iam_client.get_iam_policy(resource=resource)
+        self._store_policy(resource, policy, fetched_at=now)
+        return policy
+    
+    def _store_policy(self, resource: str, policy, fetched_at: Optional[float] = None) -> None:
+        """Cache the IAM policy for a resource as of fetched_at (default: now)"""
+        if fetched_at is None:
+            fetched_at = time.monotonic()
+        with self._policy_cache_lock:
+            self._policy_cache.pop(resource, None)
+            self._policy_cache[resource] = (fetched_at, policy)
+            while len(self._policy_cache) > POLICY_CACHE_MAXSIZE:
+                self._policy_cache.pop(next(iter(self._policy_cache)))
+    
+    def _invalidate_policy(self, resource: str) -> None:
+        """Drop the cached IAM policy for a resource"""
+        with self._policy_cache_lock:
+            self._policy_cache.pop(resource, None)
+    
+    @staticmethod
+    def _uses_metadata_credentials() -> bool:
+        """Check whether default credentials come from the GCP metadata server"""
+        try:
+            credentials, _ = google.auth.default()
+        except DefaultCredentialsError:
+            return False
+        return isinstance(credentials, compute_engine.Credentials)
     
     def _rotate_service_account_keys(self) -> Dict[str, List[str]]:
         """Rotate service account keys and update Secret Manager"""
         rotated = []
         failed = []
         
+        if self._rotation_enabled is None:
+            self._rotation_enabled = not self._uses_metadata_credentials()
+        
+        if not self._rotation_enabled:
+            logger.info("Using metadata server credentials, skipping service account key rotation")
+            return {
+                "rotated": rotated,
+                "failed": failed,
+                "note": "skipped: workload credentials in use"
+            }
+        
         try:
             # List all service accounts
             resource = f"projects/{self.project_id}"
@@ -301,20 +767,68 @@ class CloudSentinel:
         
         return {"rotated": rotated, "failed": failed}
     
+    def start_background_tasks(self) -> asyncio.Task:
+        """
+        Start periodic service account key rotation on the running event loop.
+        
+        Call this once at application startup from a long-lived loop; while
+        the task runs, ensure_environment only reports its last result instead
+        of rotating inline.
+        
+        Returns:
+            The background rotation task
+        """
+        if self._rotation_task is None or self._rotation_task.done():
+            self._rotation_task = asyncio.create_task(self._rotation_loop())
+        return self._rotation_task
+    
+    async def _rotation_loop(self, period_s: float = ROTATION_PERIOD) -> None:
+        """Rotate service account keys every period_s seconds"""
+        while True:
+            await self._run_rotation_async()
+            await asyncio.sleep(period_s)
+    
+    async def _run_rotation_async(self) -> Dict[str, List[str]]:
+        """Rotate keys off the event loop and record the outcome"""
+        result = await asyncio.to_thread(self._rotate_service_account_keys)
+        self._last_rotation_result = result
+        self._last_rotation_at = time.monotonic()
+        return result
+    
+    async def _rotation_results_async(self) -> Optional[Dict[str, List[str]]]:
+        """
+        Get the latest key rotation outcome for ensure_environment.
+        
+        Rotates inline when no background task is running and the last
+        rotation is missing or older than ROTATION_PERIOD. Returns None while
+        a background task is still on its first rotation.
+        """
+        background_running = self._rotation_task is not None and not self._rotation_task.done()
+        stale = (
+            self._last_rotation_at is None
+            or time.monotonic() - self._last_rotation_at >= ROTATION_PERIOD
+        )
+        if not background_running and stale:
+            return await self._run_rotation_async()
+        return self._last_rotation_result
+    
     def _store_key_in_secret_manager(self, sa_email: str, key_data: str) -> bool:
         """Store service account key in Secret Manager"""
         try:
-            secret_id = f"sa-key-{sa_email.replace('@', '-').replace('.', '-')}"
+            secret_id = "sa-key-" + sa_email.translate(SECRET_ID_TRANSLATION)
             parent = f"projects/{self.project_id}"
             
             # Create or update secret
             try:
-                secret = self.secret_client.create_secret(
-                    parent=parent,
-                    secret_id=secret_id,
-                    secret={
-                        "replication": {"automatic": {}}
-                    }
+                self._retry_rpc(
+                    lambda: self.secret_client.create_secret(
+                        parent=parent,
+                        secret_id=secret_id,
+                        secret={
+                            "replication": {"automatic": {}}
+                        }
+                    ),
+                    (api_exceptions.ResourceExhausted,)
                 )
                 logger.info(f"Created secret {secret_id}")
             except api_exceptions.AlreadyExists:
@@ -322,9 +836,12 @@ class CloudSentinel:
             
             # Add secret version
             secret_path = f"projects/{self.project_id}/secrets/{secret_id}"
-            version = self.secret_client.add_secret_version(
-                parent=secret_path,
-                payload={"data": key_data.encode()}
+            self._retry_rpc(
+                lambda: self.secret_client.add_secret_version(
+                    parent=secret_path,
+                    payload={"data": key_data.encode()}
+                ),
+                (api_exceptions.ResourceExhausted,)
             )
             
             logger.info(f"Added new version to secret {secret_id}")
@@ -340,6 +857,10 @@ def create_cloud_sentinel(project_id: str, location: str = "global") -> CloudSen
     """
     Create a CloudSentinel instance.
     
+    Instances are shared per (project_id, location) so repeated calls reuse
+    the same gRPC channels and credentials. The underlying clients are safe
+    for concurrent use from multiple threads.
+    
     Args:
         project_id: GCP project ID
         location: Location for Secret Manager
@@ -347,4 +868,10 @@ def create_cloud_sentinel(project_id: str, location: str = "global") -> CloudSen
     Returns:
         CloudSentinel instance
     """
+    return _shared_cloud_sentinel(project_id, location)
+
+
+@functools.lru_cache(maxsize=32)
+def _shared_cloud_sentinel(project_id: str, location: str) -> CloudSentinel:
+    """Construct a CloudSentinel once per (project_id, location)"""
     return CloudSentinel(project_id=project_id, location=location)
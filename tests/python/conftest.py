@@ -0,0 +1,68 @@
+"""
+Shared fixtures for the CloudSentinel tests.
+
+The GCP client libraries are replaced with in-memory stubs, so these tests
+run without google-cloud-* installed and never touch the network.
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# Make the repository root importable as the top-level package directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from agents import cloud_sentinel as cs  # noqa: E402
+from fakes import (  # noqa: E402
+    FakeBinding,
+    FakeIAMClient,
+    FakeResourceManagerClient,
+    FakeSecretManagerClient,
+    FakeServiceUsageClient,
+    fake_message,
+)
+
+
+@pytest.fixture
+def fake_exceptions():
+    """Distinct api_core exception types, so retry filters behave as in production"""
+    return SimpleNamespace(
+        AlreadyExists=type("AlreadyExists", (Exception,), {}),
+        FailedPrecondition=type("FailedPrecondition", (Exception,), {}),
+        Aborted=type("Aborted", (Exception,), {}),
+        ResourceExhausted=type("ResourceExhausted", (Exception,), {}),
+    )
+
+
+@pytest.fixture
+def sentinel(monkeypatch, fake_exceptions):
+    """A CloudSentinel wired to fresh stub clients, with every required API enabled"""
+    monkeypatch.setattr(cs, "GCP_AVAILABLE", True)
+    monkeypatch.setattr(cs, "api_exceptions", fake_exceptions)
+    monkeypatch.setattr(cs, "service_usage_v1", SimpleNamespace(
+        ServiceUsageClient=FakeServiceUsageClient,
+        ListServicesRequest=fake_message,
+        BatchEnableServicesRequest=fake_message,
+    ), raising=False)
+    monkeypatch.setattr(cs, "iam_v1", SimpleNamespace(
+        IAMClient=FakeIAMClient,
+        Binding=FakeBinding,
+    ), raising=False)
+    monkeypatch.setattr(cs, "secretmanager", SimpleNamespace(
+        SecretManagerServiceClient=FakeSecretManagerClient,
+    ), raising=False)
+    monkeypatch.setattr(cs, "resourcemanager_v3", SimpleNamespace(
+        ProjectsClient=FakeResourceManagerClient,
+    ), raising=False)
+
+    # Fresh clients per test instead of the process-wide shared ones
+    monkeypatch.setattr(cs, "_shared_grpc_client", lambda client_cls: client_cls())
+    monkeypatch.setattr(cs.CloudSentinel, "_uses_metadata_credentials", staticmethod(lambda: False))
+    monkeypatch.setattr(cs.CloudSentinel, "_backoff_delay", staticmethod(lambda attempt: 0.0))
+    monkeypatch.setattr(cs.CloudSentinel, "_last_result", {})
+
+    sentinel = cs.CloudSentinel("test-project")
+    sentinel.service_usage_client.enabled.update(cs.CloudSentinel.REQUIRED_APIS)
+    return sentinel
@@ -0,0 +1,112 @@
+"""
+In-memory stand-ins for the GCP client libraries used by CloudSentinel.
+"""
+
+import copy
+from types import SimpleNamespace
+
+
+class FakeBinding:
+    """Stand-in for iam_v1.Binding"""
+
+    def __init__(self, role, members=()):
+        self.role = role
+        self.members = list(members)
+
+
+class FakePolicy:
+    """Stand-in for a policy_pb2.Policy message"""
+
+    def __init__(self, bindings=(), etag="0"):
+        self.bindings = list(bindings)
+        self.etag = etag
+
+    def CopyFrom(self, other):
+        self.bindings = copy.deepcopy(other.bindings)
+        self.etag = other.etag
+
+
+class FakeOperation:
+    """Long-running operation that completes immediately"""
+
+    def result(self, timeout=None):
+        return None
+
+
+class FakeServiceUsageClient:
+    """Service Usage client with a configurable set of enabled services"""
+
+    def __init__(self):
+        self.enabled = set()
+        self.batch_error = None
+        self.calls = []
+
+    def list_services(self, request):
+        self.calls.append("list")
+        return [SimpleNamespace(config=SimpleNamespace(name=name)) for name in sorted(self.enabled)]
+
+    def batch_enable_services(self, request):
+        self.calls.append(("batch_enable", tuple(request.service_ids)))
+        if self.batch_error is not None:
+            raise self.batch_error
+        self.enabled.update(request.service_ids)
+        return FakeOperation()
+
+    def enable_service(self, name):
+        self.calls.append(("enable", name))
+        self.enabled.add(name.rsplit("/", 1)[-1])
+        return FakeOperation()
+
+
+class FakeIAMClient:
+    """IAM client holding one project policy; set_iam_policy errors can be queued"""
+
+    def __init__(self):
+        self.policy = FakePolicy()
+        self.set_errors = []
+        self.calls = []
+
+    def get_iam_policy(self, resource):
+        self.calls.append("get")
+        policy = FakePolicy()
+        policy.CopyFrom(self.policy)
+        return policy
+
+    def set_iam_policy(self, resource, policy):
+        self.calls.append("set")
+        if self.set_errors:
+            raise self.set_errors.pop(0)
+        self.policy = FakePolicy()
+        self.policy.CopyFrom(policy)
+        self.policy.etag = str(int(policy.etag) + 1)
+        updated = FakePolicy()
+        updated.CopyFrom(self.policy)
+        return updated
+
+
+class FakeResourceManagerClient:
+    """Resource Manager client granting every permission unless told otherwise"""
+
+    def __init__(self):
+        self.denied = set()
+
+    def test_iam_permissions(self, resource, permissions):
+        return SimpleNamespace(permissions=[p for p in permissions if p not in self.denied])
+
+
+class FakeSecretManagerClient:
+    """Secret Manager client recording the secrets and versions it creates"""
+
+    def __init__(self):
+        self.secrets = {}
+
+    def create_secret(self, parent, secret_id, secret):
+        self.secrets.setdefault(f"{parent}/secrets/{secret_id}", [])
+
+    def add_secret_version(self, parent, payload):
+        self.secrets[parent].append(payload["data"])
+
+
+def fake_message(**fields):
+    """Stand-in for a proto request message constructor"""
+    return SimpleNamespace(**fields)
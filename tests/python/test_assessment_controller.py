@@ -0,0 +1,139 @@
+"""
+Tests for the codebase assessment controller against a stub MCP agent.
+"""
+
+import asyncio
+import builtins
+import importlib.util
+import os
+
+import pytest
+
+CONTROLLER_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "..",
+    "tools", "assessment", "codebase-assessment", "scripts", "assessment-controller.py"
+)
+
+
+@pytest.fixture
+def controller(tmp_path, monkeypatch):
+    """The controller module, run from an empty working directory"""
+    spec = importlib.util.spec_from_file_location("assessment_controller", CONTROLLER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    monkeypatch.chdir(tmp_path)
+    return module
+
+
+class StubAgent:
+    """MCP agent whose document updates return fixed content"""
+
+    def __init__(self, content="# doc\n"):
+        self.content = content
+        self.requests = {}
+
+    async def analyze_repository(self, request):
+        return {"analysis": True}
+
+    async def identify_opportunities(self, request):
+        return ["opportunity"]
+
+    async def generate_action_items(self, request):
+        return ["action"]
+
+    async def _update(self, name, request):
+        self.requests[name] = request
+        return self.content
+
+    async def update_system_overview(self, request):
+        return await self._update("system_overview", request)
+
+    async def update_improvement_roadmap(self, request):
+        return await self._update("improvement_roadmap", request)
+
+    async def update_architecture_evolution(self, request):
+        return await self._update("architecture_evolution", request)
+
+
+def _count_writes(controller, monkeypatch):
+    writes = []
+
+    def recording_open(file, mode="r", *args, **kwargs):
+        if "w" in mode:
+            writes.append(os.path.basename(file))
+        return builtins.open(file, mode, *args, **kwargs)
+
+    monkeypatch.setattr(controller, "open", recording_open, raising=False)
+    return writes
+
+
+@pytest.mark.parametrize("content", ["# doc\nbody\n", "# doc\r\nbody\r\n"])
+def test_unchanged_docs_are_not_rewritten(controller, monkeypatch, content):
+    orchestrator = controller.CodebaseAssessmentOrchestrator(StubAgent(content))
+    writes = _count_writes(controller, monkeypatch)
+
+    asyncio.run(orchestrator.run_comprehensive_assessment())
+    assert len(writes) == 3
+
+    asyncio.run(orchestrator.run_comprehensive_assessment())
+    assert len(writes) == 3
+
+
+def test_hand_edited_doc_is_restored(controller):
+    orchestrator = controller.CodebaseAssessmentOrchestrator(StubAgent())
+    asyncio.run(orchestrator.run_comprehensive_assessment())
+
+    overview = os.path.join("output", "living-docs", "system-overview.md")
+    with open(overview, "w") as f:
+        f.write("hand edit\n")
+    asyncio.run(orchestrator.run_comprehensive_assessment())
+
+    with open(overview, newline="") as f:
+        assert f.read() == "# doc\n"
+
+
+class BarrierAgent(StubAgent):
+    """Agent whose updates and action items only finish once all four are in flight"""
+
+    def __init__(self):
+        super().__init__()
+        self.arrived = 0
+        self.all_arrived = None
+
+    async def _arrive(self):
+        # Created here so it binds to the running loop on Python 3.9
+        if self.all_arrived is None:
+            self.all_arrived = asyncio.Event()
+        self.arrived += 1
+        if self.arrived == 4:
+            self.all_arrived.set()
+        await self.all_arrived.wait()
+
+    async def _update(self, name, request):
+        await self._arrive()
+        return await super()._update(name, request)
+
+    async def generate_action_items(self, request):
+        await self._arrive()
+        return await super().generate_action_items(request)
+
+
+def test_doc_updates_and_action_items_run_concurrently(controller):
+    docs = os.path.join("output", "living-docs")
+    os.makedirs(docs)
+    for name in ("system-overview", "improvement-roadmap", "architecture-evolution"):
+        with open(os.path.join(docs, f"{name}.md"), "w") as f:
+            f.write(f"previous {name}\n")
+
+    agent = BarrierAgent()
+    orchestrator = controller.CodebaseAssessmentOrchestrator(agent)
+
+    # Run sequentially, the first update would wait on the barrier forever
+    results = asyncio.run(asyncio.wait_for(orchestrator.run_comprehensive_assessment(), timeout=5))
+
+    assert results["action_items"] == ["action"]
+    assert {name: request["previous_version"] for name, request in agent.requests.items()} == {
+        "system_overview": "previous system-overview\n",
+        "improvement_roadmap": "previous improvement-roadmap\n",
+        "architecture_evolution": "previous architecture-evolution\n",
+    }
@@ -0,0 +1,270 @@
+"""
+Tests for the CloudSentinel agent against stubbed GCP clients.
+"""
+
+import asyncio
+
+from agents import cloud_sentinel as cs
+from fakes import FakeBinding, FakePolicy
+
+
+def test_healthy_result_is_reused(sentinel):
+    first = sentinel.ensure_environment()
+    assert first["overall_status"] == "healthy"
+
+    sentinel.service_usage_client.calls.clear()
+    second = sentinel.ensure_environment()
+
+    assert second == first
+    assert sentinel.service_usage_client.calls == []
+
+
+def test_failed_refresh_drops_cached_healthy_result(sentinel, monkeypatch):
+    assert sentinel.ensure_environment()["overall_status"] == "healthy"
+
+    async def broken():
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(sentinel, "_ensure_required_apis_async", broken)
+    refreshed = sentinel.ensure_environment(force_refresh=True)
+    assert refreshed["overall_status"] == "error"
+
+    # Without force_refresh the stale healthy result must not come back
+    assert sentinel.ensure_environment()["overall_status"] == "error"
+
+
+def test_missing_caller_permission_is_reported_without_policy_scan(sentinel):
+    sentinel.resource_manager_client.denied.add("cloudbuild.builds.create")
+
+    result = sentinel.ensure_environment()
+
+    assert result["permissions_missing"] == ["roles/cloudbuild.builds.builder:cloudbuild.builds.create"]
+    assert "roles/logging.logWriter:logging.logEntries.create" in result["permissions_valid"]
+    assert result["overall_status"] == "issues_found"
+    assert sentinel.iam_client.calls == []
+
+    # Results with issues are not reused
+    sentinel.resource_manager_client.denied.clear()
+    assert sentinel.ensure_environment()["overall_status"] == "healthy"
+
+
+def test_enabled_services_are_relisted_each_run(sentinel):
+    assert sentinel.ensure_environment()["overall_status"] == "healthy"
+
+    # Someone disables an API after the first run
+    sentinel.service_usage_client.enabled.discard("logging.googleapis.com")
+    result = sentinel.ensure_environment(force_refresh=True)
+
+    assert ("batch_enable", ("logging.googleapis.com",)) in sentinel.service_usage_client.calls
+    assert "logging.googleapis.com" in result["apis_enabled"]
+    assert result["apis_failed"] == []
+
+
+def test_ensure_bindings_leaves_cached_policy_untouched_on_failure(sentinel):
+    sentinel.iam_client.set_errors.append(RuntimeError("permission denied"))
+    resource = "projects/test-project"
+    cached = sentinel._get_policy_cached(resource)
+
+    assert sentinel.ensure_role("a@x.com", "roles/logging.logWriter") is False
+    assert cached.bindings == []
+    assert resource not in sentinel._policy_cache
+
+
+def test_audit_reports_each_service_account_against_critical_roles(sentinel):
+    sentinel.iam_client.policy = FakePolicy([
+        FakeBinding("roles/logging.logWriter", ["serviceAccount:a@x.com", "user:u@x.com"]),
+        FakeBinding("roles/viewer", ["serviceAccount:b@x.com"]),
+    ])
+
+    audit = sentinel.audit_service_account_roles()
+
+    assert audit["valid"] == ["a@x.com:roles/logging.logWriter"]
+    assert "b@x.com:roles/logging.logWriter" in audit["missing"]
+    assert len(audit["missing"]) == 2 * len(sentinel.CRITICAL_ROLES) - 1
+    assert not any(entry.startswith("u@x.com") for entry in audit["missing"])
+
+
+def test_credentials_are_checked_on_first_rotation_only(sentinel, monkeypatch):
+    checks = []
+
+    def uses_metadata_credentials():
+        checks.append(True)
+        return True
+
+    monkeypatch.setattr(sentinel, "_uses_metadata_credentials", uses_metadata_credentials)
+    assert checks == []
+
+    for _ in range(2):
+        result = sentinel._rotate_service_account_keys()
+        assert result["note"] == "skipped: workload credentials in use"
+    assert checks == [True]
+
+
+def test_policy_cache_reuses_fetch_within_ttl(sentinel):
+    resource = "projects/test-project"
+    first = sentinel._get_policy_cached(resource)
+
+    assert sentinel._get_policy_cached(resource) is first
+    assert sentinel.iam_client.calls == ["get"]
+
+    # An expired entry is refetched
+    assert sentinel._get_policy_cached(resource, ttl=0) is not first
+    assert sentinel.iam_client.calls == ["get", "get"]
+
+
+def test_policy_cache_evicts_least_recently_used(sentinel, monkeypatch):
+    monkeypatch.setattr(cs, "POLICY_CACHE_MAXSIZE", 2)
+
+    sentinel._get_policy_cached("projects/a")
+    sentinel._get_policy_cached("projects/b")
+    sentinel._get_policy_cached("projects/a")  # a is now the most recently used
+    sentinel._get_policy_cached("projects/c")
+
+    assert list(sentinel._policy_cache) == ["projects/a", "projects/c"]
+
+
+def test_ensure_bindings_retries_etag_conflict_on_fresh_policy(sentinel, fake_exceptions):
+    sentinel.iam_client.set_errors.append(fake_exceptions.Aborted("etag mismatch"))
+
+    result = sentinel.ensure_bindings([
+        ("a@x.com", "roles/logging.logWriter"),
+        ("b@x.com", "roles/logging.logWriter"),
+    ])
+
+    assert all(result.values())
+    assert sentinel.iam_client.calls == ["get", "set", "get", "set"]
+    (binding,) = sentinel.iam_client.policy.bindings
+    assert binding.members == ["serviceAccount:a@x.com", "serviceAccount:b@x.com"]
+
+
+def test_ensure_bindings_writes_nothing_when_already_bound(sentinel):
+    sentinel.iam_client.policy = FakePolicy([
+        FakeBinding("roles/logging.logWriter", ["serviceAccount:a@x.com"]),
+    ])
+
+    assert sentinel.ensure_role("a@x.com", "roles/logging.logWriter") is True
+    assert sentinel.iam_client.calls == ["get"]
+
+
+def test_batch_enable_falls_back_to_per_api_enables(sentinel):
+    client = sentinel.service_usage_client
+    client.enabled -= {"logging.googleapis.com", "monitoring.googleapis.com"}
+    client.batch_error = RuntimeError("batch rejected")
+
+    result = asyncio.run(sentinel._ensure_required_apis_async())
+
+    assert ("batch_enable", ("logging.googleapis.com", "monitoring.googleapis.com")) in client.calls
+    assert {call for call in client.calls if call[0] == "enable"} == {
+        ("enable", "projects/test-project/services/logging.googleapis.com"),
+        ("enable", "projects/test-project/services/monitoring.googleapis.com"),
+    }
+    assert sorted(result["enabled"]) == sorted(sentinel.REQUIRED_APIS)
+    assert result["failed"] == []
+
+
+def test_audit_ignores_members_that_are_not_service_accounts(sentinel):
+    sentinel.iam_client.policy = FakePolicy([
+        FakeBinding("roles/logging.logWriter", [
+            "user:serviceAccount@x.com",
+            "group:ops@x.com",
+            "serviceAccount:a@x.com",
+        ]),
+    ])
+
+    audit = sentinel.audit_service_account_roles()
+
+    assert {entry.split(":", 1)[0] for entry in audit["valid"] + audit["missing"]} == {"a@x.com"}
+
+
+def test_key_is_stored_under_translated_secret_id(sentinel):
+    assert sentinel._store_key_in_secret_manager("ci-bot@proj.iam.gserviceaccount.com", "key") is True
+
+    assert sentinel.secret_client.secrets == {
+        "projects/test-project/secrets/sa-key-ci-bot-proj-iam-gserviceaccount-com": [b"key"],
+    }
+
+
+def test_rotation_runs_inline_without_task_then_reuses_until_period(sentinel, monkeypatch):
+    rotations = []
+
+    def rotate():
+        rotations.append(True)
+        return {"rotated": [], "failed": []}
+
+    monkeypatch.setattr(sentinel, "_rotate_service_account_keys", rotate)
+
+    assert sentinel.ensure_environment()["key_rotation_status"] == "completed"
+    assert sentinel.ensure_environment(force_refresh=True)["key_rotation_status"] == "completed"
+    assert rotations == [True]
+
+    # Once the last rotation is ROTATION_PERIOD old, the next run rotates again
+    sentinel._last_rotation_at -= cs.ROTATION_PERIOD
+    sentinel.ensure_environment(force_refresh=True)
+    assert rotations == [True, True]
+
+
+def test_rotation_pending_while_background_task_has_no_result(sentinel):
+    async def run():
+        sentinel._rotation_task = asyncio.create_task(asyncio.Event().wait())
+        try:
+            return await sentinel.ensure_environment_async()
+        finally:
+            sentinel._rotation_task.cancel()
+
+    result = asyncio.run(run())
+
+    assert result["key_rotation_status"] == "pending"
+    assert result["overall_status"] == "healthy"
+    assert sentinel._last_result == {}
+
+
+def test_ensure_environment_works_inside_a_running_loop(sentinel):
+    async def agent():
+        return sentinel.ensure_environment()
+
+    assert asyncio.run(agent())["overall_status"] == "healthy"
+
+
+def test_create_cloud_sentinel_shares_instances_per_project_and_location(sentinel):
+    cs._shared_cloud_sentinel.cache_clear()
+    try:
+        first = cs.create_cloud_sentinel("p1")
+
+        assert cs.create_cloud_sentinel("p1") is first
+        assert cs.create_cloud_sentinel("p1", location="global") is first
+        assert cs.create_cloud_sentinel("p1", location="europe-west1") is not first
+        assert cs.create_cloud_sentinel("p2") is not first
+    finally:
+        cs._shared_cloud_sentinel.cache_clear()
+
+
+def test_shared_grpc_client_is_built_once_per_class_with_keepalive(monkeypatch):
+    monkeypatch.setattr(cs, "_shared_clients", {})
+    channels = []
+
+    class Transport:
+        def __init__(self, channel):
+            self.channel = channel
+
+        @staticmethod
+        def create_channel(options):
+            channels.append(options)
+            return object()
+
+    class Client:
+        def __init__(self, transport):
+            self.transport = transport
+
+        @staticmethod
+        def get_transport_class(name):
+            assert name == "grpc"
+            return Transport
+
+    class OtherClient(Client):
+        pass
+
+    client = cs._shared_grpc_client(Client)
+
+    assert cs._shared_grpc_client(Client) is client
+    assert cs._shared_grpc_client(OtherClient) is not client
+    assert channels == [list(cs.GRPC_CHANNEL_OPTIONS)] * 2
@@ -6,13 +6,13 @@ Orchestrates MCP agents for comprehensive codebase analysis
 
 import json
 import asyncio
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 
 class CodebaseAssessmentOrchestrator:
     def __init__(self, mcp_agent_endpoint):
         self.agent = mcp_agent_endpoint
-        self.assessment_date = datetime.now().isoformat()
+        self.assessment_date = datetime.now(timezone.utc).isoformat()
     
     async def run_comprehensive_assessment(self):
         """Run full codebase assessment using MCP agent"""
@@ -41,11 +41,12 @@ class CodebaseAssessmentOrchestrator:
             ]
         })
         
-        # Phase 3: Living Documentation Update
-        await self.update_living_documentation(repo_analysis, opportunities)
-        
-        # Phase 4: Generate Action Items
-        action_items = await self.generate_action_items(opportunities)
+        # Phases 3 & 4: Living Documentation Update and Action Items
+        # Both only consume the opportunities, so they run concurrently
+        _, action_items = await asyncio.gather(
+            self.update_living_documentation(repo_analysis, opportunities),
+            self.generate_action_items(opportunities)
+        )
         
         return {
             "assessment_date": self.assessment_date,
@@ -57,33 +58,43 @@ class CodebaseAssessmentOrchestrator:
     async def update_living_documentation(self, analysis, opportunities):
         """Update living documentation with latest findings"""
         
-        # Update system overview
-        system_overview = await self.agent.update_system_overview({
-            "current_analysis": analysis,
-            "previous_version": self.load_previous_overview(),
-            "template": "system_overview_template.md"
-        })
-        
-        # Update improvement roadmap
-        improvement_roadmap = await self.agent.update_improvement_roadmap({
-            "current_analysis": analysis,
-            "opportunities": opportunities,
-            "previous_version": self.load_previous_roadmap(),
-            "template": "improvement_roadmap_template.md"
-        })
+        # Load previous versions without blocking the event loop
+        previous_overview, previous_roadmap, previous_evolution = await asyncio.gather(
+            asyncio.to_thread(self.load_previous_overview),
+            asyncio.to_thread(self.load_previous_roadmap),
+            asyncio.to_thread(self.load_previous_architecture_evolution)
+        )
         
-        # Update architecture evolution document
-        architecture_evolution = await self.agent.update_architecture_evolution({
-            "current_analysis": analysis,
-            "previous_version": self.load_previous_architecture_evolution(),
-            "template": "architecture_evolution_template.md"
-        })
+        # Update system overview, improvement roadmap and architecture
+        # evolution concurrently; none depends on another's output
+        system_overview, improvement_roadmap, architecture_evolution = await asyncio.gather(
+            self.agent.update_system_overview({
+                "current_analysis": analysis,
+                "previous_version": previous_overview,
+                "template": "system_overview_template.md"
+            }),
+            self.agent.update_improvement_roadmap({
+                "current_analysis": analysis,
+                "opportunities": opportunities,
+                "previous_version": previous_roadmap,
+                "template": "improvement_roadmap_template.md"
+            }),
+            self.agent.update_architecture_evolution({
+                "current_analysis": analysis,
+                "previous_version": previous_evolution,
+                "template": "architecture_evolution_template.md"
+            })
+        )
         
         # Save updated documentation
-        self.save_documentation({
+        await asyncio.to_thread(self.save_documentation, {
             "system_overview": system_overview,
             "improvement_roadmap": improvement_roadmap,
             "architecture_evolution": architecture_evolution
+        }, {
+            "system_overview": previous_overview,
+            "improvement_roadmap": previous_roadmap,
+            "architecture_evolution": previous_evolution
         })
         
         return {
@@ -130,15 +141,22 @@ class CodebaseAssessmentOrchestrator:
             return evolution_path.read_text()
         return None
     
-    def save_documentation(self, documentation):
+    def save_documentation(self, documentation, previous_documentation=None):
         """Save updated documentation to output directory"""
         output_dir = Path("output/living-docs")
         output_dir.mkdir(parents=True, exist_ok=True)
+        previous_documentation = previous_documentation or {}
         
-        # Save each document
+        # Save each document, skipping those identical to what is on disk;
+        # the previous docs were read with universal newlines, so compare
+        # (and write) with \n line endings
         for doc_name, content in documentation.items():
+            content = content.replace("\r\n", "\n")
+            if previous_documentation.get(doc_name) == content:
+                continue
             file_path = output_dir / f"{doc_name.replace('_', '-')}.md"
-            file_path.write_text(content)
+            with open(file_path, "w", newline="\n") as f:
+                f.write(content)
         
         # Save assessment metadata
         metadata = {